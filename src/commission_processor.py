@@ -14,6 +14,19 @@ import logging
 
 from .llm_extraction_service import LLMExtractionService
 
+# Common patterns for commission statements, compiled once at import
+_BASIC_INFO_PATTERNS = {
+    key: re.compile(pattern, re.IGNORECASE)
+    for key, pattern in {
+        'statement_date': r'(?:statement|report)?\s*date[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
+        'period_start': r'period[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
+        'period_end': r'(?:to|through)[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
+        'total_commission': r'total\s*commission[:\s]*\$?([\d,]+\.?\d*)',
+        'agency_name': r'agency[:\s]+([A-Za-z\s]+)',
+        'agent_id': r'(?:agent|producer)\s*(?:id|number)[:\s]+(\w+)'
+    }.items()
+}
+
 class CommissionProcessor:
     """Main class for processing commission statements from multiple carriers"""
     
@@ -377,18 +390,8 @@ class CommissionProcessor:
         """Extract basic information from text using regex patterns"""
         info = {}
         
-        # Common patterns for commission statements
-        patterns = {
-            'statement_date': r'(?:statement|report)?\s*date[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-            'period_start': r'period[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-            'period_end': r'(?:to|through)[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})',
-            'total_commission': r'total\s*commission[:\s]*\$?([\d,]+\.?\d*)',
-            'agency_name': r'agency[:\s]+([A-Za-z\s]+)',
-            'agent_id': r'(?:agent|producer)\s*(?:id|number)[:\s]+(\w+)'
-        }
-        
-        for key, pattern in patterns.items():
-            match = re.search(pattern, text, re.IGNORECASE)
+        for key, pattern in _BASIC_INFO_PATTERNS.items():
+            match = pattern.search(text)
             if match:
                 info[key] = match.group(1).strip()
         
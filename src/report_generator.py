@@ -5,165 +5,49 @@ Generates comprehensive reconciliation reports in multiple formats
 
 import os
 import json
+import math
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Any
 import logging
-from jinja2 import Template
-import matplotlib.pyplot as plt
-import seaborn as sns
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
+from concurrent.futures import ThreadPoolExecutor
+from jinja2 import Environment
 
-class ReportGenerator:
-    """Generates comprehensive commission reconciliation reports"""
-    
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
+# matplotlib/seaborn and reportlab are imported on first use (see _load_pyplot and _generate_pdf_report):
+# they dominate this module's import time and are not needed for the Excel/HTML/JSON outputs
+
+try:
+    import orjson
+except ImportError:  # Optional accelerator - the standard json module is used when unavailable
+    orjson = None
+
+# Top-level result entries that hold aggregate analyses rather than a carrier's results
+_NON_CARRIER_KEYS = frozenset({'cross_carrier_analysis', 'period_analysis'})
+
+def _as_float(value: Any) -> float:
+    """Coerce a result figure for display - None or unparseable values count as 0"""
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+_pyplot = None
+
+def _load_pyplot():
+    """Import pyplot with the report chart style on first use"""
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib
+        matplotlib.use('Agg')  # Charts are only saved to files - no GUI backend needed
+        import matplotlib.pyplot as plt
+        import seaborn as sns
         sns.set_style("whitegrid")
         plt.style.use('default')
-    
-    def generate_reports(self, reconciliation_results: Dict[str, Any], output_dir: str) -> List[str]:
-        """
-        Generate all reconciliation reports
-        
-        Args:
-            reconciliation_results: Results from reconciliation analysis
-            output_dir: Directory to save reports
-            
-        Returns:
-            List of generated report file paths
-        """
-        report_files = []
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        try:
-            # Generate Excel summary report
-            excel_file = self._generate_excel_report(reconciliation_results, output_dir, timestamp)
-            if excel_file:
-                report_files.append(excel_file)
-            
-            # Generate detailed HTML report
-            html_file = self._generate_html_report(reconciliation_results, output_dir, timestamp)
-            if html_file:
-                report_files.append(html_file)
-            
-            # Generate PDF executive summary
-            pdf_file = self._generate_pdf_report(reconciliation_results, output_dir, timestamp)
-            if pdf_file:
-                report_files.append(pdf_file)
-            
-            # Generate JSON data export
-            json_file = self._generate_json_export(reconciliation_results, output_dir, timestamp)
-            if json_file:
-                report_files.append(json_file)
-            
-            # Generate visualization charts
-            chart_files = self._generate_charts(reconciliation_results, output_dir, timestamp)
-            report_files.extend(chart_files)
-            
-        except Exception as e:
-            self.logger.error(f"Error generating reports: {str(e)}")
-        
-        return report_files
-    
-    def _generate_excel_report(self, results: Dict[str, Any], output_dir: str, timestamp: str) -> str:
-        """Generate comprehensive Excel report with multiple sheets"""
-        filename = f"commission_reconciliation_report_{timestamp}.xlsx"
-        filepath = os.path.join(output_dir, filename)
-        
-        try:
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
-                # Summary sheet
-                summary_data = []
-                for carrier, data in results.items():
-                    if carrier == 'cross_carrier_analysis':
-                        continue
-                    
-                    summary_data.append({
-                        'Carrier': carrier.replace('_', ' ').title(),
-                        'Total Commissions': data.get('total_commissions', 0),
-                        'Expected Commissions': data.get('expected_commissions', 0),
-                        'Variance Amount': data.get('variance_amount', 0),
-                        'Variance %': data.get('variance_percentage', 0),
-                        'Discrepancies Count': len(data.get('discrepancies', [])),
-                        'Overpayments': len([d for d in data.get('discrepancies', []) if d.get('type') == 'overpayment']),
-                        'Underpayments': len([d for d in data.get('discrepancies', []) if d.get('type') == 'underpayment'])
-                    })
-                
-                summary_df = pd.DataFrame(summary_data)
-                summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                
-                # Individual carrier sheets
-                for carrier, data in results.items():
-                    if carrier == 'cross_carrier_analysis':
-                        continue
-                    
-                    sheet_name = carrier.replace('_', ' ').title()[:31]  # Excel sheet name limit
-                    
-                    # Create carrier detail sheet
-                    carrier_data = []
-                    
-                    # Add summary info
-                    carrier_data.append(['Metric', 'Value'])
-                    carrier_data.append(['Total Commissions', f"${data.get('total_commissions', 0):,.2f}"])
-                    carrier_data.append(['Expected Commissions', f"${data.get('expected_commissions', 0):,.2f}"])
-                    carrier_data.append(['Variance Amount', f"${data.get('variance_amount', 0):,.2f}"])
-                    carrier_data.append(['Variance Percentage', f"{data.get('variance_percentage', 0):.2f}%"])
-                    carrier_data.append(['', ''])  # Empty row
-                    
-                    # Add discrepancies
-                    if data.get('discrepancies'):
-                        carrier_data.append(['Discrepancies', ''])
-                        carrier_data.append(['Type', 'Amount', 'Details'])
-                        
-                        for disc in data.get('discrepancies', []):
-                            carrier_data.append([
-                                disc.get('type', ''),
-                                f"${disc.get('amount', 0):,.2f}",
-                                disc.get('reason', '')
-                            ])
-                    
-                    carrier_df = pd.DataFrame(carrier_data)
-                    carrier_df.to_excel(writer, sheet_name=sheet_name, index=False, header=False)
-                
-                # Cross-carrier analysis sheet
-                if 'cross_carrier_analysis' in results:
-                    cross_data = results['cross_carrier_analysis']
-                    cross_rows = []
-                    
-                    cross_rows.append(['Cross-Carrier Analysis', ''])
-                    cross_rows.append(['Total All Carriers', f"${cross_data.get('total_all_carriers', 0):,.2f}"])
-                    cross_rows.append(['', ''])
-                    
-                    if 'carrier_comparison' in cross_data:
-                        cross_rows.append(['Carrier', 'Amount', 'Percentage'])
-                        for carrier, comp_data in cross_data['carrier_comparison'].items():
-                            cross_rows.append([
-                                carrier.replace('_', ' ').title(),
-                                f"${comp_data.get('amount', 0):,.2f}",
-                                f"{comp_data.get('percentage', 0):.1f}%"
-                            ])
-                    
-                    cross_df = pd.DataFrame(cross_rows)
-                    cross_df.to_excel(writer, sheet_name='Cross-Carrier Analysis', index=False, header=False)
-            
-            self.logger.info(f"Excel report generated: {filepath}")
-            return filepath
-            
-        except Exception as e:
-            self.logger.error(f"Error generating Excel report: {str(e)}")
-            return ""
-    
-    def _generate_html_report(self, results: Dict[str, Any], output_dir: str, timestamp: str) -> str:
-        """Generate detailed HTML report"""
-        filename = f"commission_reconciliation_report_{timestamp}.html"
-        filepath = os.path.join(output_dir, filename)
-        
-        html_template = """
+        _pyplot = plt
+    return _pyplot
+
+# Detailed HTML report layout - compiled once per process, rendered per report
+_HTML_TEMPLATE = Environment().from_string("""
         <!DOCTYPE html>
         <html>
         <head>
@@ -232,7 +116,7 @@ class ReportGenerator:
             {% for carrier, data in carriers.items() %}
             <div class="carrier-section">
                 <div class="carrier-header">
-                    🏢 {{ carrier.replace('_', ' ').title() }} Commission Analysis
+                    🏢 {{ carrier_stats[carrier].display_name }} Commission Analysis
                 </div>
                 <div class="carrier-content">
                     <div class="variance-summary">
@@ -258,7 +142,7 @@ class ReportGenerator:
                     <div class="variance-section">
                         <div class="variance-header">🔴 Overpayments ({{ data.overpayments|length }} subscribers)</div>
                         <div class="alert-warning">
-                            Total Overpaid: <strong>${{ "%.2f"|format(data.overpayments|sum(attribute='amount')) }}</strong>
+                            Total Overpaid: <strong>${{ "%.2f"|format(carrier_stats[carrier].overpayment_total) }}</strong>
                         </div>
                         <table>
                             <thead>
@@ -289,7 +173,7 @@ class ReportGenerator:
                     <div class="variance-section">
                         <div class="variance-header">🔵 Underpayments ({{ data.underpayments|length }} subscribers)</div>
                         <div class="alert-danger">
-                            Total Underpaid: <strong>${{ "%.2f"|format(data.underpayments|sum(attribute='amount')) }}</strong>
+                            Total Underpaid: <strong>${{ "%.2f"|format(carrier_stats[carrier].underpayment_total) }}</strong>
                         </div>
                         <table>
                             <thead>
@@ -367,58 +251,267 @@ class ReportGenerator:
             </div>
         </body>
         </html>
+        """)
+
+class ReportGenerator:
+    """Generates comprehensive commission reconciliation reports"""
+    
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        
+        # PDF paragraph styles - built on the first PDF and shared by every later report
+        self._pdf_styles: Dict[str, Any] = {}
+    
+    def _load_pdf_styles(self) -> Dict[str, Any]:
+        """Build the PDF paragraph styles once"""
+        if not self._pdf_styles:
+            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+            from reportlab.lib import colors
+            
+            sheet = getSampleStyleSheet()
+            self._pdf_styles = {
+                'sheet': sheet,
+                'title': ParagraphStyle(
+                    'CustomTitle',
+                    parent=sheet['Heading1'],
+                    fontSize=24,
+                    spaceAfter=30,
+                    textColor=colors.darkblue
+                ),
+                # Wrapping text in the overpayment/underpayment reason columns
+                'reason': ParagraphStyle(
+                    'ReasonStyle',
+                    parent=sheet['Normal'],
+                    fontSize=7,
+                    leading=8,
+                    leftIndent=2,
+                    rightIndent=2
+                )
+            }
+        return self._pdf_styles
+    
+    def generate_reports(self, reconciliation_results: Dict[str, Any], output_dir: str) -> List[str]:
         """
+        Generate all reconciliation reports
+        
+        Args:
+            reconciliation_results: Results from reconciliation analysis
+            output_dir: Directory to save reports
+            
+        Returns:
+            List of generated report file paths
+        """
+        report_files = []
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
         try:
-            # Calculate totals across all carriers
-            total_overpayments = 0
-            total_underpayments = 0
-            total_discrepancies = 0
-            
-            # Process variance data for each carrier
-            processed_carriers = {}
-            for carrier, data in results.items():
-                if carrier == 'cross_carrier_analysis':
-                    continue
-                    
-                # Initialize processed data structure with existing data
-                processed_data = dict(data)
+            # Shared per-carrier figures, computed once for every format
+            view = self._build_view_model(reconciliation_results)
+            
+            # The document formats are independent and mostly file I/O / native serialization - write them
+            # concurrently: Excel summary, detailed HTML, PDF executive summary and JSON data export
+            generators = (self._generate_excel_report, self._generate_html_report,
+                          self._generate_pdf_report, self._generate_json_export)
+            with ThreadPoolExecutor(max_workers=len(generators)) as executor:
+                futures = [executor.submit(generate, view, output_dir, timestamp) for generate in generators]
+                
+                # Generate visualization charts meanwhile - pyplot's global state stays on this thread
+                chart_files = self._generate_charts(view, output_dir, timestamp)
                 
-                # The overpayments and underpayments are already structured correctly
-                # Just need to calculate totals
-                if 'overpayments' in data and data['overpayments']:
-                    for overpayment in data['overpayments']:
-                        total_overpayments += overpayment.get('amount', 0)
+                # Collect in the fixed order above, skipping formats that failed
+                report_files.extend(report_file for report_file in (future.result() for future in futures) if report_file)
+            
+            report_files.extend(chart_files)
+            
+        except Exception as e:
+            self.logger.error(f"Error generating reports: {str(e)}")
+        
+        return report_files
+    
+    def _build_view_model(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Collect the carriers and their derived counts/totals once, for all report generators"""
+        carriers = {}
+        carrier_stats = {}
+        totals = {'overpayments': 0, 'underpayments': 0, 'discrepancy_count': 0, 'variance_count': 0}
+        
+        for carrier, data in results.items():
+            if carrier in _NON_CARRIER_KEYS:
+                continue
+            
+            # Ensure subscriber_variances exists (use the existing one or fall back to the old field name)
+            if 'subscriber_variances' not in data:
+                data = {**data, 'subscriber_variances': data.get('employer_variances', [])}
+            carriers[carrier] = data
+            
+            overpayments = data.get('overpayments') or []
+            underpayments = data.get('underpayments') or []
+            stats = {
+                'display_name': carrier.replace('_', ' ').title(),
+                'overpayment_total': sum(_as_float(overpayment.get('amount')) for overpayment in overpayments),
+                'underpayment_total': sum(_as_float(underpayment.get('amount')) for underpayment in underpayments),
+                'discrepancy_count': len(data.get('discrepancies') or []),
+                'variance_count': len(overpayments) + len(underpayments),
+                # Display strings shared by the Excel carrier sheets and the PDF carrier table - coerced here,
+                # since a bad figure would otherwise abort every format before any report is written
+                'formatted': {
+                    'total': f"${_as_float(data.get('total_commissions')):,.2f}",
+                    'expected': f"${_as_float(data.get('expected_commissions')):,.2f}",
+                    'variance': f"${_as_float(data.get('variance_amount')):,.2f}",
+                    'variance_pct': f"{_as_float(data.get('variance_percentage')):.2f}%"
+                }
+            }
+            carrier_stats[carrier] = stats
+            
+            totals['overpayments'] += stats['overpayment_total']
+            totals['underpayments'] += stats['underpayment_total']
+            totals['discrepancy_count'] += stats['discrepancy_count']
+            totals['variance_count'] += stats['variance_count']
+        
+        return {
+            'results': results,
+            'carriers': carriers,
+            'carrier_stats': carrier_stats,
+            'totals': totals,
+            'cross': results.get('cross_carrier_analysis'),
+            'report_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+    
+    def _generate_excel_report(self, view: Dict[str, Any], output_dir: str, timestamp: str) -> str:
+        """Generate comprehensive Excel report with multiple sheets"""
+        filename = f"commission_reconciliation_report_{timestamp}.xlsx"
+        filepath = os.path.join(output_dir, filename)
+        
+        try:
+            # No constant_memory mode: it only keeps the current row in memory, but to_excel writes the Summary
+            # frame column by column, so every earlier row's cells would be silently dropped
+            with pd.ExcelWriter(filepath, engine='xlsxwriter') as writer:
+                # Shared cell formats - numbers stay numeric (and sortable) in the Summary sheet
+                money_format = writer.book.add_format({'num_format': '$#,##0.00'})
+                percent_format = writer.book.add_format({'num_format': '0.00"%"'})
                 
-                if 'underpayments' in data and data['underpayments']:
-                    for underpayment in data['underpayments']:
-                        total_underpayments += underpayment.get('amount', 0)
+                # Summary sheet - built column-wise, one list per output column
+                summary_data = {
+                    'Carrier': [],
+                    'Total Commissions': [],
+                    'Expected Commissions': [],
+                    'Variance Amount': [],
+                    'Variance %': [],
+                    'Discrepancies Count': [],
+                    'Overpayments': [],
+                    'Underpayments': []
+                }
+                carrier_stats = view['carrier_stats']
+                for carrier, data in view['carriers'].items():
+                    # Count overpayment/underpayment discrepancies in a single pass
+                    discrepancies = data.get('discrepancies', [])
+                    overpayment_count = underpayment_count = 0
+                    for disc in discrepancies:
+                        disc_type = disc.get('type')
+                        if disc_type == 'overpayment':
+                            overpayment_count += 1
+                        elif disc_type == 'underpayment':
+                            underpayment_count += 1
+                    
+                    summary_data['Carrier'].append(carrier_stats[carrier]['display_name'])
+                    summary_data['Total Commissions'].append(data.get('total_commissions', 0))
+                    summary_data['Expected Commissions'].append(data.get('expected_commissions', 0))
+                    summary_data['Variance Amount'].append(data.get('variance_amount', 0))
+                    summary_data['Variance %'].append(data.get('variance_percentage', 0))
+                    summary_data['Discrepancies Count'].append(len(discrepancies))
+                    summary_data['Overpayments'].append(overpayment_count)
+                    summary_data['Underpayments'].append(underpayment_count)
                 
-                # Ensure subscriber_variances exists (use the existing one or create from data)  
-                if 'subscriber_variances' not in processed_data:
-                    # If old field name exists, use it, otherwise create empty
-                    processed_data['subscriber_variances'] = processed_data.get('employer_variances', [])
+                summary_df = pd.DataFrame(summary_data)
+                summary_df.to_excel(writer, sheet_name='Summary', index=False)
+                summary_sheet = writer.sheets['Summary']
+                summary_sheet.set_column('B:D', None, money_format)  # Total / Expected / Variance Amount
+                summary_sheet.set_column('E:E', None, percent_format)  # Variance % (already in percent units)
                 
-                # Count discrepancies
-                total_discrepancies += len(processed_data.get('discrepancies', []))
-                total_discrepancies += len(processed_data.get('overpayments', []))
-                total_discrepancies += len(processed_data.get('underpayments', []))
+                # Individual carrier sheets
+                for carrier, data in view['carriers'].items():
+                    sheet_name = carrier_stats[carrier]['display_name'][:31]  # Excel sheet name limit
+                    
+                    # Create carrier detail sheet
+                    carrier_data = []
+                    
+                    # Add summary info
+                    carrier_data.append(['Metric', 'Value'])
+                    formatted = carrier_stats[carrier]['formatted']
+                    carrier_data.append(['Total Commissions', formatted['total']])
+                    carrier_data.append(['Expected Commissions', formatted['expected']])
+                    carrier_data.append(['Variance Amount', formatted['variance']])
+                    carrier_data.append(['Variance Percentage', formatted['variance_pct']])
+                    carrier_data.append(['', ''])  # Empty row
+                    
+                    # Add discrepancies
+                    discrepancies = data.get('discrepancies')
+                    if discrepancies:
+                        carrier_data.append(['Discrepancies', ''])
+                        carrier_data.append(['Type', 'Amount', 'Details'])
+                        
+                        for disc in discrepancies:
+                            carrier_data.append([
+                                disc.get('type', ''),
+                                f"${disc.get('amount', 0):,.2f}",
+                                disc.get('reason', '')
+                            ])
+                    
+                    self._write_rows(writer, sheet_name, carrier_data)
                 
-                processed_carriers[carrier] = processed_data
+                # Cross-carrier analysis sheet
+                cross_data = view['cross']
+                if cross_data is not None:
+                    cross_rows = []
+                    
+                    cross_rows.append(['Cross-Carrier Analysis', ''])
+                    cross_rows.append(['Total All Carriers', f"${cross_data.get('total_all_carriers', 0):,.2f}"])
+                    cross_rows.append(['', ''])
+                    
+                    if 'carrier_comparison' in cross_data:
+                        cross_rows.append(['Carrier', 'Amount', 'Percentage'])
+                        for carrier, comp_data in cross_data['carrier_comparison'].items():
+                            cross_rows.append([
+                                carrier.replace('_', ' ').title(),
+                                f"${comp_data.get('amount', 0):,.2f}",
+                                f"{comp_data.get('percentage', 0):.1f}%"
+                            ])
+                    
+                    self._write_rows(writer, 'Cross-Carrier Analysis', cross_rows)
+            
+            self.logger.info(f"Excel report generated: {filepath}")
+            return filepath
             
-            # Prepare template data
+        except Exception as e:
+            self.logger.error(f"Error generating Excel report: {str(e)}")
+            return ""
+    
+    @staticmethod
+    def _write_rows(writer: pd.ExcelWriter, sheet_name: str, rows: List[List[Any]]) -> None:
+        """Write ragged rows straight to a worksheet - no DataFrame round-trip for non-tabular sheets"""
+        worksheet = writer.sheets.get(sheet_name) or writer.book.add_worksheet(sheet_name)
+        for row_idx, row in enumerate(rows):
+            worksheet.write_row(row_idx, 0, row)
+    
+    def _generate_html_report(self, view: Dict[str, Any], output_dir: str, timestamp: str) -> str:
+        """Generate detailed HTML report"""
+        filename = f"commission_reconciliation_report_{timestamp}.html"
+        filepath = os.path.join(output_dir, filename)
+        
+        try:
+            # Prepare template data - totals across all carriers come from the shared view
+            totals = view['totals']
             template_data = {
-                'report_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'carriers': processed_carriers,
-                'cross_carrier_analysis': results.get('cross_carrier_analysis', {}),
-                'carrier_count': len(processed_carriers),
-                'total_discrepancies': total_discrepancies,
-                'total_overpayments': total_overpayments,
-                'total_underpayments': total_underpayments
+                'report_date': view['report_date'],
+                'carriers': view['carriers'],
+                'carrier_stats': view['carrier_stats'],
+                'cross_carrier_analysis': view['cross'] or {},
+                'carrier_count': len(view['carriers']),
+                'total_discrepancies': totals['discrepancy_count'] + totals['variance_count'],
+                'total_overpayments': totals['overpayments'],
+                'total_underpayments': totals['underpayments']
             }
             
-            template = Template(html_template)
-            html_content = template.render(**template_data)
+            html_content = _HTML_TEMPLATE.render(**template_data)
             
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(html_content)
@@ -430,38 +523,36 @@ class ReportGenerator:
             self.logger.error(f"Error generating HTML report: {str(e)}")
             return ""
     
-    def _generate_pdf_report(self, results: Dict[str, Any], output_dir: str, timestamp: str) -> str:
+    def _generate_pdf_report(self, view: Dict[str, Any], output_dir: str, timestamp: str) -> str:
         """Generate PDF executive summary report with detailed variance analysis"""
         filename = f"commission_reconciliation_summary_{timestamp}.pdf"
         filepath = os.path.join(output_dir, filename)
         
         try:
+            from reportlab.lib.pagesizes import letter
+            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+            from reportlab.lib import colors
+            from reportlab.lib.units import inch
+            
             doc = SimpleDocTemplate(filepath, pagesize=letter)
-            styles = getSampleStyleSheet()
+            pdf_styles = self._load_pdf_styles()
+            styles = pdf_styles['sheet']
             story = []
             
             # Title
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                spaceAfter=30,
-                textColor=colors.darkblue
-            )
-            
-            story.append(Paragraph("Commission Reconciliation Report", title_style))
-            story.append(Paragraph(f"Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
+            story.append(Paragraph("Commission Reconciliation Report", pdf_styles['title']))
+            story.append(Paragraph(f"Generated on {view['report_date']}", styles['Normal']))
             story.append(Spacer(1, 20))
             
             # Executive Summary
             story.append(Paragraph("Executive Summary", styles['Heading2']))
             
-            if 'cross_carrier_analysis' in results:
-                cross_data = results['cross_carrier_analysis']
-                total_discrepancies = sum(len(v.get('overpayments', [])) + len(v.get('underpayments', [])) for k, v in results.items() if k != 'cross_carrier_analysis')
+            cross_data = view['cross']
+            if cross_data is not None:
+                total_discrepancies = view['totals']['variance_count']
                 summary_text = f"""
                 Total Commission Processed: ${cross_data.get('total_all_carriers', 0):,.2f}<br/>
-                Number of Carriers: {len([k for k in results.keys() if k != 'cross_carrier_analysis'])}<br/>
+                Number of Carriers: {len(view['carriers'])}<br/>
                 Total Discrepancies: {total_discrepancies}
                 """
                 story.append(Paragraph(summary_text, styles['Normal']))
@@ -473,15 +564,13 @@ class ReportGenerator:
             
             table_data = [['Carrier', 'Total Commissions', 'Variance Amount', 'Discrepancies']]
             
-            for carrier, data in results.items():
-                if carrier == 'cross_carrier_analysis':
-                    continue
-                
-                discrepancies_count = len(data.get('overpayments', [])) + len(data.get('underpayments', []))
+            carrier_stats = view['carrier_stats']
+            for stats in carrier_stats.values():
+                discrepancies_count = stats['variance_count']
                 table_data.append([
-                    carrier.replace('_', ' ').title(),
-                    f"${data.get('total_commissions', 0):,.2f}",
-                    f"${data.get('variance_amount', 0):,.2f}",
+                    stats['display_name'],
+                    stats['formatted']['total'],
+                    stats['formatted']['variance'],
                     str(discrepancies_count)
                 ])
             
@@ -505,37 +594,21 @@ class ReportGenerator:
             story.append(Spacer(1, 10))
             
             # Process each carrier for detailed analysis
-            for carrier, data in results.items():
-                if carrier == 'cross_carrier_analysis':
-                    continue
+            for carrier, data in view['carriers'].items():
+                story.append(Paragraph(f"{carrier_stats[carrier]['display_name']} Analysis", styles['Heading3']))
                 
-                story.append(Paragraph(f"{carrier.replace('_', ' ').title()} Analysis", styles['Heading3']))
+                # Look up each section's rows once per carrier
+                overpayments = data.get('overpayments')
+                underpayments = data.get('underpayments')
+                subscriber_variances = data.get('subscriber_variances')
+                discrepancies = data.get('discrepancies')
                 
                 # Overpayments Table
-                if data.get('overpayments') and len(data['overpayments']) > 0:
+                if overpayments:
                     story.append(Paragraph("Overpayments", styles['Heading4']))
                     
                     overpay_data = [['Policy ID', 'Subscriber', 'Overpayment Amount', 'Percentage', 'Reason']]
-                    
-                    # Create a paragraph style for wrapping text in reason column
-                    reason_style = ParagraphStyle(
-                        'ReasonStyle',
-                        parent=styles['Normal'],
-                        fontSize=7,
-                        leading=8,
-                        leftIndent=2,
-                        rightIndent=2
-                    )
-                    
-                    for overpay in data['overpayments']:
-                        reason_paragraph = Paragraph(str(overpay.get('reason', 'N/A')), reason_style)
-                        overpay_data.append([
-                            str(overpay.get('policy_number', 'N/A')),
-                            str(overpay.get('member_name', 'N/A'))[:20],  # Slightly truncate for space
-                            f"${overpay.get('amount', 0):,.2f}",
-                            f"{overpay.get('percentage', 0):.1f}%",
-                            reason_paragraph  # Use paragraph for word wrapping
-                        ])
+                    overpay_data.extend(self._variance_rows(overpayments))
                     
                     overpay_table = Table(overpay_data, colWidths=[0.8*inch, 1.2*inch, 1*inch, 0.7*inch, 3.8*inch])
                     overpay_table.setStyle(TableStyle([
@@ -554,19 +627,11 @@ class ReportGenerator:
                     story.append(Spacer(1, 10))
                 
                 # Underpayments Table
-                if data.get('underpayments') and len(data['underpayments']) > 0:
+                if underpayments:
                     story.append(Paragraph("Underpayments", styles['Heading4']))
                     
                     underpay_data = [['Policy ID', 'Subscriber', 'Underpayment Amount', 'Percentage', 'Reason']]
-                    for underpay in data['underpayments']:
-                        reason_paragraph = Paragraph(str(underpay.get('reason', 'N/A')), reason_style)
-                        underpay_data.append([
-                            str(underpay.get('policy_number', 'N/A')),
-                            str(underpay.get('member_name', 'N/A'))[:20],  # Slightly truncate for space
-                            f"${underpay.get('amount', 0):,.2f}",
-                            f"{underpay.get('percentage', 0):.1f}%",
-                            reason_paragraph  # Use paragraph for word wrapping
-                        ])
+                    underpay_data.extend(self._variance_rows(underpayments))
                     
                     underpay_table = Table(underpay_data, colWidths=[0.8*inch, 1.2*inch, 1*inch, 0.7*inch, 3.8*inch])
                     underpay_table.setStyle(TableStyle([
@@ -585,11 +650,11 @@ class ReportGenerator:
                     story.append(Spacer(1, 10))
                 
                 # Subscriber Variance Summary (if not already shown in overpayments/underpayments)
-                if not data.get('overpayments') and not data.get('underpayments') and data.get('subscriber_variances') and len(data['subscriber_variances']) > 0:
+                if not overpayments and not underpayments and subscriber_variances:
                     story.append(Paragraph("Subscriber Variance Analysis", styles['Heading4']))
                     
                     variance_data = [['Policy ID', 'Subscriber', 'Expected', 'Actual', 'Variance', 'Variance %']]
-                    for variance in data['subscriber_variances']:
+                    for variance in subscriber_variances:
                         variance_data.append([
                             str(variance.get('policy_id', 'N/A')),
                             str(variance.get('subscriber_name', 'N/A'))[:25],  # Truncate for space
@@ -615,9 +680,9 @@ class ReportGenerator:
                     story.append(Spacer(1, 15))
                 
                 # Legacy discrepancies section (if any exist)
-                if data.get('discrepancies'):
+                if discrepancies:
                     story.append(Paragraph("Other Discrepancies:", styles['Heading4']))
-                    for disc in data.get('discrepancies', []):
+                    for disc in discrepancies:
                         disc_type = disc.get('type', '').title()
                         actual_amount = disc.get('actual_amount', 0)
                         expected_amount = disc.get('expected_amount', 0)
@@ -637,27 +702,69 @@ class ReportGenerator:
             self.logger.error(f"Error generating PDF report: {str(e)}")
             return ""
     
-    def _generate_json_export(self, results: Dict[str, Any], output_dir: str, timestamp: str) -> str:
+    def _variance_rows(self, entries: List[Dict[str, Any]]) -> List[List[Any]]:
+        """PDF table rows for overpayment/underpayment entries"""
+        from reportlab.platypus import Paragraph
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        from reportlab.lib.units import inch
+        
+        reason_style = self._load_pdf_styles()['reason']
+        # Reason column width (3.8 inch in the variance tables) less the cell's default 6pt side paddings
+        reason_width = 3.8 * inch - 12
+        rows = []
+        for entry in entries:
+            get = entry.get
+            policy_number = get('policy_number', 'N/A')
+            member_name = get('member_name', 'N/A')
+            reason = get('reason', 'N/A')
+            # Values are normally strings already - only convert the ones that are not
+            if not isinstance(reason, str):
+                reason = str(reason)
+            
+            # Only reasons too wide for one line pay for a Paragraph (markup parse + line wrapping);
+            # the rest are plain cells in the table's own 7pt Helvetica
+            if stringWidth(reason, 'Helvetica', 7) > reason_width:
+                reason = Paragraph(reason, reason_style)
+            
+            rows.append([
+                policy_number if isinstance(policy_number, str) else str(policy_number),
+                (member_name if isinstance(member_name, str) else str(member_name))[:20],  # Slightly truncate for space
+                f"${get('amount', 0):,.2f}",
+                f"{get('percentage', 0):.1f}%",
+                reason
+            ])
+        return rows
+    
+    def _generate_json_export(self, view: Dict[str, Any], output_dir: str, timestamp: str) -> str:
         """Generate JSON export of all reconciliation data"""
         filename = f"commission_reconciliation_data_{timestamp}.json"
         filepath = os.path.join(output_dir, filename)
         
         try:
-            # Convert numpy types to Python native types for JSON serialization
-            def convert_types(obj):
-                if hasattr(obj, 'item'):
-                    return obj.item()
-                elif isinstance(obj, dict):
-                    return {k: convert_types(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [convert_types(v) for v in obj]
-                else:
-                    return obj
-            
-            clean_results = convert_types(results)
-            
-            with open(filepath, 'w') as f:
-                json.dump(clean_results, f, indent=2, default=str)
+            if orjson is not None:
+                # Serialized in C straight to bytes - numpy values are handled natively
+                with open(filepath, 'wb') as f:
+                    f.write(orjson.dumps(view['results'], default=str,
+                                         option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
+            else:
+                # Convert numpy types to Python native types for JSON serialization, writing NaN/infinity
+                # as null like orjson does - the export is the same whichever serializer is installed
+                def convert_types(obj):
+                    if hasattr(obj, 'item'):
+                        obj = obj.item()
+                    if isinstance(obj, float):
+                        return obj if math.isfinite(obj) else None
+                    elif isinstance(obj, dict):
+                        return {k: convert_types(v) for k, v in obj.items()}
+                    elif isinstance(obj, list):
+                        return [convert_types(v) for v in obj]
+                    else:
+                        return obj
+                
+                clean_results = convert_types(view['results'])
+                
+                with open(filepath, 'w') as f:
+                    json.dump(clean_results, f, indent=2, default=str)
             
             self.logger.info(f"JSON export generated: {filepath}")
             return filepath
@@ -666,25 +773,29 @@ class ReportGenerator:
             self.logger.error(f"Error generating JSON export: {str(e)}")
             return ""
     
-    def _generate_charts(self, results: Dict[str, Any], output_dir: str, timestamp: str) -> List[str]:
+    def _generate_charts(self, view: Dict[str, Any], output_dir: str, timestamp: str) -> List[str]:
         """Generate visualization charts"""
         chart_files = []
         
         try:
+            plt = _load_pyplot()
+            
             # Commission by carrier pie chart
-            if 'cross_carrier_analysis' in results and results['cross_carrier_analysis'].get('carrier_breakdown'):
-                carrier_data = results['cross_carrier_analysis']['carrier_breakdown']
-                
-                plt.figure(figsize=(10, 8))
-                carriers = [k.replace('_', ' ').title() for k in carrier_data.keys()]
-                amounts = list(carrier_data.values())
-                
-                plt.pie(amounts, labels=carriers, autopct='%1.1f%%', startangle=90)
-                plt.title('Commission Distribution by Carrier', fontsize=16, fontweight='bold')
+            if view['cross'] is not None and view['cross'].get('carrier_breakdown'):
+                carrier_data = view['cross']['carrier_breakdown']
                 
-                chart_file = os.path.join(output_dir, f"commission_by_carrier_{timestamp}.png")
-                plt.savefig(chart_file, dpi=300, bbox_inches='tight')
-                plt.close()
+                fig = plt.figure(figsize=(10, 8))
+                try:
+                    carriers = [k.replace('_', ' ').title() for k in carrier_data.keys()]
+                    amounts = list(carrier_data.values())
+                    
+                    plt.pie(amounts, labels=carriers, autopct='%1.1f%%', startangle=90)
+                    plt.title('Commission Distribution by Carrier', fontsize=16, fontweight='bold')
+                    
+                    chart_file = os.path.join(output_dir, f"commission_by_carrier_{timestamp}.png")
+                    plt.savefig(chart_file, dpi=300, bbox_inches='tight')
+                finally:
+                    plt.close(fig)  # Release the figure even if drawing fails
                 
                 chart_files.append(chart_file)
                 self.logger.info(f"Pie chart generated: {chart_file}")
@@ -693,32 +804,31 @@ class ReportGenerator:
             carriers = []
             variances = []
             
-            for carrier, data in results.items():
-                if carrier == 'cross_carrier_analysis':
-                    continue
-                
-                carriers.append(carrier.replace('_', ' ').title())
+            for carrier, data in view['carriers'].items():
+                carriers.append(view['carrier_stats'][carrier]['display_name'])
                 variances.append(data.get('variance_amount', 0))
             
             if carriers and variances:
-                plt.figure(figsize=(12, 6))
-                colors_list = ['green' if v >= 0 else 'red' for v in variances]
-                
-                plt.bar(carriers, variances, color=colors_list, alpha=0.7)
-                plt.title('Commission Variance by Carrier', fontsize=16, fontweight='bold')
-                plt.xlabel('Carrier')
-                plt.ylabel('Variance Amount ($)')
-                plt.xticks(rotation=45)
-                plt.grid(True, alpha=0.3)
-                
-                # Add value labels on bars
-                for i, v in enumerate(variances):
-                    plt.text(i, v + (max(variances) * 0.01), f'${v:,.0f}', 
-                            ha='center', va='bottom', fontweight='bold')
-                
-                chart_file = os.path.join(output_dir, f"variance_analysis_{timestamp}.png")
-                plt.savefig(chart_file, dpi=300, bbox_inches='tight')
-                plt.close()
+                fig = plt.figure(figsize=(12, 6))
+                try:
+                    colors_list = ['green' if v >= 0 else 'red' for v in variances]
+                    
+                    plt.bar(carriers, variances, color=colors_list, alpha=0.7)
+                    plt.title('Commission Variance by Carrier', fontsize=16, fontweight='bold')
+                    plt.xlabel('Carrier')
+                    plt.ylabel('Variance Amount ($)')
+                    plt.xticks(rotation=45)
+                    plt.grid(True, alpha=0.3)
+                    
+                    # Add value labels on bars
+                    for i, v in enumerate(variances):
+                        plt.text(i, v + (max(variances) * 0.01), f'${v:,.0f}', 
+                                ha='center', va='bottom', fontweight='bold')
+                    
+                    chart_file = os.path.join(output_dir, f"variance_analysis_{timestamp}.png")
+                    plt.savefig(chart_file, dpi=300, bbox_inches='tight')
+                finally:
+                    plt.close(fig)
                 
                 chart_files.append(chart_file)
                 self.logger.info(f"Bar chart generated: {chart_file}")